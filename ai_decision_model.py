@@ -1,19 +1,118 @@
 import numpy as np
-import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 import random
+import copy
 import joblib
 import re # Import the regular expressions library
+import queue
+import threading
+import time
+import os
+from concurrent.futures import Future
 
+# Optional: ONNX Runtime scores tiny per-request batches far faster than sklearn.
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+# Optional: skl2onnx is only needed to export the forest, not to load an exported .onnx file.
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    convert_sklearn = None
+
+from numba_compat import njit
 from data_models import *
 
+@njit(cache=True)
+def _simulate_core(km, speed, priority_weight, direction, decision, target_idx):
+    """
+    Advances every train for 30 minutes and returns the priority-weighted delay caused by `decision`.
+    `km` is a scratch copy and is advanced in place; `speed` is read-only, the decision only
+    changes the target train's speed, which is kept in a local instead of a copied array.
+    """
+    sim_duration_min, time_step_min, headway_km = 30, 5, 6.0
+    target_speed = speed[target_idx]
+    if decision == 1: target_speed *= 0.6
+    elif decision == 2 or decision == 4: target_speed = 0.0
+    total_weighted_delay = 0.0
+    for _ in range(0, sim_duration_min, time_step_min):
+        # Stable sort keeps ties in position order, like sorted() did on the TrainPosition list
+        order = np.argsort(km, kind='mergesort')
+        for i in range(order.shape[0]):
+            idx = order[i]
+            current_speed = target_speed if idx == target_idx else speed[idx]
+            if i > 0:
+                prev = order[i - 1]
+                if direction[idx] == direction[prev] and abs(km[idx] - km[prev]) < headway_km:
+                    prev_speed = target_speed if prev == target_idx else speed[prev]
+                    current_speed = min(current_speed, prev_speed * 0.8, 20.0)
+            km[idx] += current_speed * (time_step_min / 60.0)
+            delay_increase = (1 - (current_speed / 80)) * (time_step_min / 5) if current_speed < 80 else 0.0
+            total_weighted_delay += delay_increase * priority_weight[idx]
+    return total_weighted_delay
+
+class PredictionBatcher:
+    """
+    Scores feature matrices submitted by concurrent callers in one model call.
+    A single background thread takes the first pending request, waits up to `max_wait_s`
+    for more (anything already queued is always included), stacks them, scores the stack
+    once with `score_fn`, and hands each caller its slice through a Future.
+    """
+    def __init__(self, score_fn, max_wait_s: float = 0.0):
+        self._score_fn = score_fn
+        self._max_wait_s = max_wait_s
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, X: np.ndarray) -> Future:
+        # Started lazily so a pre-forking server (e.g. gunicorn --preload) gets a thread per worker
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="prediction-batcher", daemon=True)
+                self._thread.start()
+        future = Future()
+        self._queue.put((X, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait_s
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    pending.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                predictions, probabilities = self._score_fn(np.concatenate([X for X, _ in pending]))
+            except Exception as exc:
+                for _, future in pending: future.set_exception(exc)
+                continue
+            offset = 0
+            for X, future in pending:
+                future.set_result((predictions[offset:offset + len(X)], probabilities[offset:offset + len(X)]))
+                offset += len(X)
+
+# Matches the coordination hint emitted by _generate_reasoning for decision 3 ("Give priority").
+_HOLD_PATTERN = re.compile(r"Action: Train (\S+) should be held", re.ASCII)
+
 class RailwayDecisionAI:
     def __init__(self, section_info: SectionInfo):
         self.section = section_info
-        self.model = RandomForestClassifier(n_estimators=150, random_state=42, n_jobs=-1, class_weight='balanced')
+        # 64 shallow-ish trees, pruned to the best 50 after fitting; more trees only add predict latency.
+        self.model = RandomForestClassifier(n_estimators=64, max_depth=12, random_state=42, n_jobs=-1, class_weight='balanced')
         self.is_trained = False
+        self._ort_session = None
+        self._batcher = None
+        # Platform ratio depends only on the station code, so look it up instead of scanning stations per train
+        self._platform_ratio_cache = {s.code: s.platforms/6.0 for s in section_info.stations}
+        self._segments = np.array(section_info.single_line_segments, dtype=float).reshape(-1, 2) # (S x 2) start/end km
         self.feature_columns = [
             'train_priority', 'train_type_encoded', 'current_speed', 'delay_minutes',
             'distance_to_destination', 'trains_ahead', 'single_line_conflict',
@@ -25,42 +124,45 @@ class RailwayDecisionAI:
             3: "Give priority", 4: "Hold/Reroute"
         }
 
-    def predict_optimal_decisions(self, schedules: List[TrainSchedule], positions: List[TrainPosition]) -> Dict[str, Dict]:
+    def predict_optimal_decisions(self, schedules: List[TrainSchedule], positions: List[TrainPosition], soa: Optional[PositionsSoA] = None) -> Dict[str, Dict]:
         if not self.is_trained: raise RuntimeError("Model is not trained. Please train or load a model first.")
-        features_df = self.extract_features(schedules, positions)
-        if features_df.empty: return {}
-        
-        X = features_df[self.feature_columns].values
+        X, context = self.extract_features(schedules, positions, soa)
+        if not len(X): return {}
         
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)
+        if self._batcher is not None:
+            predictions, probabilities = self._batcher.submit(X).result()
+        else:
+            predictions, probabilities = self._score(X)
+        confidences = probabilities.max(axis=1).tolist()
         
         # --- STEP 1: Generate initial results from the model ---
+        # Plain dict rows and column arrays are much cheaper to read than per-row `iloc` Series
+        records = self._context_records(context)
+        train_numbers = context['train_number'].tolist()
         initial_results = {}
-        for i, train_number in enumerate(features_df['train_number']):
+        for i, train_number in enumerate(train_numbers):
             pred = predictions[i]
             initial_results[train_number] = {
                 'decision': self.decision_map[pred],
-                'confidence': float(max(probabilities[i])),
-                'reasoning': self._generate_reasoning(features_df.iloc[i], pred, features_df)
+                'confidence': confidences[i],
+                'reasoning': self._generate_reasoning(records[i], pred, context)
             }
             
         # --- STEP 2: NEW - Post-processing for decision consistency ---
         final_results = initial_results.copy()
         overrides = {} # To store which trains need their decisions overridden
 
-        for train_number, result in initial_results.items():
-            # Use regex to find "Action: Train [NUMBER] should be held..."
-            match = re.search(r"Action: Train (\S+) should be held", result['reasoning'])
-            if match:
-                train_to_hold = match.group(1)
-                # If the targeted train exists in our results, schedule an override
-                if train_to_hold in final_results:
-                    overrides[train_to_hold] = {
-                        'decision': self.decision_map[4], # "Hold/Reroute"
-                        'reasoning': f"Holding at station to allow high-priority train {train_number} to overtake as per AI coordination.",
-                        'confidence': 0.99 # Override with high confidence
-                    }
+        # Extract "Action: Train [NUMBER] should be held..." from all reasonings in one pass
+        held = {train_number: match.group(1) for train_number, result in initial_results.items()
+                if (match := _HOLD_PATTERN.search(result['reasoning']))}
+        for train_number, train_to_hold in held.items():
+            # If the targeted train exists in our results, schedule an override
+            if train_to_hold in final_results:
+                overrides[train_to_hold] = {
+                    'decision': self.decision_map[4], # "Hold/Reroute"
+                    'reasoning': f"Holding at station to allow high-priority train {train_number} to overtake as per AI coordination.",
+                    'confidence': 0.99 # Override with high confidence
+                }
         
         # Apply the overrides to the final results
         for train_number, override_data in overrides.items():
@@ -68,162 +170,291 @@ class RailwayDecisionAI:
             
         return final_results
 
-    def extract_features(self, schedules: List[TrainSchedule], positions: List[TrainPosition]) -> pd.DataFrame:
-        # ... (no changes in this method, keeping it for completeness)
-        features, pos_dict, schedule_dict = [], {p.train_number: p for p in positions}, {s.train_number: s for s in schedules}
-        for position in positions:
-            if position.train_number not in schedule_dict or position.status in [TrainStatus.COMPLETED, TrainStatus.SCHEDULED]: continue
-            schedule = schedule_dict[position.train_number]
-            features.append({
-                # MODEL FEATURES
-                'train_number': schedule.train_number, 'train_priority': schedule.priority.value,
-                'train_type_encoded': self._encode_train_type(schedule.train_type), 'current_speed': position.speed,
-                'delay_minutes': position.delay_minutes, 'distance_to_destination': self._calculate_remaining_distance(schedule, position),
-                'trains_ahead': self._count_trains_ahead(schedule, position, positions), 'single_line_conflict': self._check_single_line_conflict(position),
-                'platform_availability': self._check_platform_availability(position), 'time_of_day': datetime.now().hour,
-                'train_frequency': self._calculate_train_frequency(schedules, datetime.now()),
-                'time_to_next_bottleneck': self._calculate_time_to_next_bottleneck(schedule, position),
-                'downstream_congestion': self._calculate_downstream_congestion(schedule, position, positions),
-                'conflicting_train_eta': self._find_conflicting_train_eta(schedule, position, positions, schedules),
-                # CONTEXTUAL FEATURES (for reasoning, not for model)
-                'origin': schedule.origin,
-                'current_km': position.current_km
-            })
-        return pd.DataFrame(features)
-
-    # ... (train_model, _get_priority_weight, simulations, save/load remain unchanged)
-
-    def train_model(self, X_train, y_train):
+    def extract_features(self, schedules: List[TrainSchedule], positions: List[TrainPosition], soa: Optional[PositionsSoA] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Returns the float32 model input `X` (one row per active train, columns in `feature_columns` order)
+        and a `context` dict of float64/object column arrays used for reasoning and labelling.
+        """
+        if soa is None: soa = PositionsSoA.from_list(positions, schedules)
+        schedule_dict = {s.train_number: s for s in schedules}
+        has_schedule = np.array([p.train_number in schedule_dict for p in positions], dtype=bool)
+        is_moving = np.array([p.status not in [TrainStatus.COMPLETED, TrainStatus.SCHEDULED] for p in positions], dtype=bool)
+        active_idx = np.flatnonzero(has_schedule & is_moving)
+        X = np.empty((active_idx.size, len(self.feature_columns)), dtype=np.float32)
+        if active_idx.size == 0: return X, {}
+        active = [(schedule_dict[positions[i].train_number], positions[i]) for i in active_idx]
+        km, speed, direction = soa.km[active_idx], soa.speed[active_idx], soa.origin_sign[active_idx]
+        # Identical for every train in one request, so compute them once
+        now = datetime.now()
+        train_frequency = self._calculate_train_frequency(schedules, now)
+
+        # Pairwise signed distance from every active train to every position on the section (N x M),
+        # replacing the per-train Python scans for trains ahead and downstream congestion.
+        ahead_km = (soa.km[None, :] - km[:, None]) * direction[:, None]
+        is_ahead = ahead_km > 0
+        # Distance from every position to each single-line segment entry in its direction of travel (M x S)
+        all_entry_km = self._distance_to_segment_entries(soa.km, soa.origin_sign)
+        entry_km = all_entry_km[active_idx]
+        opposing = has_schedule[None, :] & (soa.origin_sign[None, :] != direction[:, None])
+
+        features = {
+            # MODEL FEATURES
+            'train_number': soa.train_number[active_idx],
+            'train_priority': [s.priority.value for s, _ in active],
+            'train_type_encoded': [self._encode_train_type(s.train_type) for s, _ in active],
+            'current_speed': speed,
+            'delay_minutes': soa.delay[active_idx],
+            'distance_to_destination': np.where(direction == 1, self.section.total_distance - km, km),
+            'trains_ahead': is_ahead.sum(axis=1),
+            'single_line_conflict': self._single_line_mask(km).astype(int),
+            'platform_availability': [self._check_platform_availability(p) for _, p in active],
+            'time_of_day': now.hour,
+            'train_frequency': train_frequency,
+            'time_to_next_bottleneck': self._calculate_time_to_next_bottleneck(entry_km, speed),
+            'downstream_congestion': (is_ahead & (ahead_km <= 50)).sum(axis=1) / 5.0,
+            'conflicting_train_eta': self._find_conflicting_train_eta(entry_km, speed, all_entry_km, soa.speed, opposing),
+            # CONTEXTUAL FEATURES (for reasoning, not for model)
+            'origin': np.array([s.origin for s, _ in active], dtype=object),
+            'current_km': km
+        }
+        for j, col in enumerate(self.feature_columns):
+            X[:, j] = features[col]
+        context = {col: np.asarray(features[col]) for col in (
+            'train_number', 'origin', 'current_km', 'train_priority', 'delay_minutes',
+            'downstream_congestion', 'time_to_next_bottleneck', 'conflicting_train_eta')}
+        return X, context
+
+    @staticmethod
+    def _context_records(context: Dict[str, np.ndarray]) -> List[Dict]:
+        """Row-wise plain dicts over the `extract_features` context arrays."""
+        keys = list(context)
+        return [dict(zip(keys, row)) for row in zip(*(context[k].tolist() for k in keys))]
+
+    def train_model(self, X_train, y_train, keep_trees: int = 50):
         print(f"Training AI model on {len(X_train)} curated samples...")
+        # Trees split on float32 internally; converting up front avoids sklearn's own float64 -> float32 copy
+        X_train = np.ascontiguousarray(X_train, dtype=np.float32)
         self.model.fit(X_train, y_train)
+        self._prune_forest(X_train, np.asarray(y_train), keep_trees)
+        self.model.n_jobs = 1 # Parallel fit only; joblib dispatch outweighs the work on per-request batches
         self.is_trained = True
+        self._build_inference_session()
         print("Model training completed!")
 
+    def _prune_forest(self, X, y, keep_trees: int):
+        """Keeps the `keep_trees` trees with the best out-of-bag accuracy, without retraining."""
+        if len(self.model.estimators_) <= keep_trees: return
+        scores = []
+        for tree, in_bag in zip(self.model.estimators_, self.model.estimators_samples_):
+            oob = np.ones(len(X), dtype=bool)
+            oob[in_bag] = False
+            if not oob.any():
+                scores.append(0.0)
+                continue
+            # Trees are fitted on encoded labels, so map their argmax back through the forest's classes_
+            tree_pred = self.model.classes_[np.argmax(tree.predict_proba(X[oob]), axis=1)]
+            scores.append(float(np.mean(tree_pred == y[oob])))
+        keep = np.sort(np.argsort(scores)[::-1][:keep_trees])
+        self.model.estimators_ = [self.model.estimators_[i] for i in keep]
+        self.model.n_estimators = len(self.model.estimators_)
+        print(f"Pruned forest to {self.model.n_estimators} trees (mean OOB accuracy {np.mean([scores[i] for i in keep]):.3f}).")
+
     def _get_priority_weight(self, priority: Priority) -> float:
         if priority == Priority.CRITICAL: return 4.0
         if priority == Priority.HIGH: return 2.5
         if priority == Priority.MEDIUM: return 1.5
         return 1.0
 
-    def _generate_optimal_decision_by_simulation(self, feature_row: pd.Series, schedules, positions) -> int:
+    def _generate_optimal_decision_by_simulation(self, feature_row: Dict, schedules, positions, sim_arrays: Optional[Dict] = None) -> int:
         if feature_row['train_priority'] >= 3 and feature_row['delay_minutes'] < 10: return 3
+        # Callers labelling a whole scenario should build `sim_arrays` once and pass it in
+        if sim_arrays is None: sim_arrays = self._build_simulation_arrays(schedules, positions)
+        target_idx = sim_arrays['index'][feature_row['train_number']]
         outcomes = {}
         for decision in [d for d in self.decision_map.keys() if d != 3]:
-            train_schedule = next(s for s in schedules if s.train_number == feature_row['train_number'])
-            outcomes[decision] = self._simulate_future_delays(schedules, positions, train_schedule, decision)
+            outcomes[decision] = self._simulate_future_delays(sim_arrays, target_idx, decision)
         return min(outcomes, key=outcomes.get)
 
-    def _simulate_future_delays(self, schedules, positions, train_to_modify, decision) -> float:
-        sim_duration_min, time_step_min, headway_km = 30, 5, 6.0
-        sim_positions = {p.train_number: TrainPosition(**p.__dict__) for p in positions}
+    def _build_simulation_arrays(self, schedules, positions) -> Dict:
+        """Marshals the positions into the flat arrays consumed by `_simulate_core`."""
         schedule_dict = {s.train_number: s for s in schedules}
-        target_pos = sim_positions[train_to_modify.train_number]
-        if decision == 1: target_pos.speed *= 0.6
-        elif decision == 2 or decision == 4: target_pos.speed = 0
-        total_weighted_delay = 0
-        for _ in range(0, sim_duration_min, time_step_min):
-            sorted_pos = sorted(list(sim_positions.values()), key=lambda p: p.current_km)
-            for i, pos in enumerate(sorted_pos):
-                schedule = schedule_dict[pos.train_number]
-                direction = 1 if schedule.origin == "SUR" else -1
-                current_speed = pos.speed
-                if i > 0:
-                    prev_pos = sorted_pos[i - 1]
-                    if schedule.origin == schedule_dict[prev_pos.train_number].origin and abs(pos.current_km - prev_pos.current_km) < headway_km:
-                        current_speed = min(current_speed, prev_pos.speed * 0.8, 20)
-                pos.current_km += current_speed * (time_step_min / 60.0)
-                delay_increase = (1 - (current_speed / 80)) * (time_step_min / 5) if current_speed < 80 else 0
-                pos.delay_minutes += delay_increase
-                total_weighted_delay += delay_increase * self._get_priority_weight(schedule.priority)
-        return total_weighted_delay
+        position_schedules = [schedule_dict[p.train_number] for p in positions]
+        return {
+            'index': {p.train_number: i for i, p in enumerate(positions)},
+            'km': np.array([p.current_km for p in positions], dtype=np.float64),
+            'speed': np.array([p.speed for p in positions], dtype=np.float64),
+            'priority_weight': np.array([self._get_priority_weight(s.priority) for s in position_schedules], dtype=np.float64),
+            'direction': np.array([1 if s.origin == "SUR" else -1 for s in position_schedules], dtype=np.int64),
+            'sim_km': np.empty(len(positions), dtype=np.float64), # Scratch buffer reused by every simulation
+        }
+
+    def _simulate_future_delays(self, sim_arrays: Dict, target_idx: int, decision: int) -> float:
+        np.copyto(sim_arrays['sim_km'], sim_arrays['km'])
+        return _simulate_core(sim_arrays['sim_km'], sim_arrays['speed'], sim_arrays['priority_weight'], sim_arrays['direction'], decision, target_idx)
 
     def save_model(self, path: str = "railway_ai_model.joblib"):
         if not self.is_trained: raise RuntimeError("Cannot save an untrained model.")
         joblib.dump(self.model, path)
         print(f"Model saved to {path}")
+        if convert_sklearn is None: return
+        # Export the ONNX graph alongside, so load_model doesn't have to convert on every start
+        try:
+            with open(self._onnx_path(path), "wb") as f: f.write(self._to_onnx())
+            print(f"ONNX model saved to {self._onnx_path(path)}")
+        except Exception as e:
+            print(f"Warning: ONNX export failed ({e}); load_model will convert at startup.")
 
     def load_model(self, path: str = "railway_ai_model.joblib"):
         try:
             self.model, self.is_trained = joblib.load(path), True
+            self.model.n_jobs = 1
             print(f"Model loaded from {path}")
+            self._build_inference_session(self._onnx_path(path))
         except FileNotFoundError:
             self.is_trained = False
             print(f"Warning: Model file not found at {path}.")
+
+    @staticmethod
+    def _onnx_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".onnx"
+
+    def _score(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (predicted labels, class probabilities) for the float32 feature matrix `X`."""
+        if self._ort_session is not None:
+            # A single ONNX pass returns both the labels and the class probabilities.
+            predictions, probabilities = self._ort_session.run(None, {"input": X})
+        else:
+            # `predict` is argmax(predict_proba) mapped through classes_, so reuse the single probability pass
+            probabilities = self._predict_proba_serial(X)
+            predictions = self.model.classes_[np.argmax(probabilities, axis=1)]
+        return predictions, probabilities
+
+    def enable_batching(self, max_wait_s: float = 0.0):
+        """Routes inference from concurrent `predict_optimal_decisions` calls through a shared PredictionBatcher."""
+        self._batcher = PredictionBatcher(self._score, max_wait_s)
+
+    def warm_up(self):
+        """Runs one dummy inference so the first real request doesn't pay the backend's lazy initialisation."""
+        if not self.is_trained: return
+        self._score(np.zeros((1, len(self.feature_columns)), dtype=np.float32))
+
+    def _predict_proba_serial(self, X: np.ndarray) -> np.ndarray:
+        """Averages the per-tree probabilities in-process, skipping sklearn's repeated input validation."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        probabilities = sum(tree.predict_proba(X, check_input=False) for tree in self.model.estimators_)
+        return probabilities / len(self.model.estimators_)
+
+    def _build_inference_session(self, onnx_path: str):
+        """Caches an ONNX Runtime session over `onnx_path`, converting the forest if that file is missing."""
+        self._ort_session = None
+        if ort is None:
+            print("onnxruntime not installed; using scikit-learn for inference.")
+            return
+        try:
+            if os.path.exists(onnx_path):
+                with open(onnx_path, "rb") as f: onnx_bytes = f.read()
+            elif convert_sklearn is not None:
+                print(f"No ONNX model at {onnx_path}; converting the forest (save_model exports it).")
+                onnx_bytes = self._to_onnx()
+            else:
+                print("skl2onnx not installed and no exported ONNX model; using scikit-learn for inference.")
+                return
+            sess_options = ort.SessionOptions()
+            sess_options.intra_op_num_threads = 1
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._ort_session = ort.InferenceSession(onnx_bytes, sess_options, providers=["CPUExecutionProvider"])
+        except Exception as e:
+            print(f"Warning: ONNX Runtime session unavailable ({e}); using scikit-learn for inference.")
+            return
+        print("ONNX Runtime inference session ready.")
+
+    def _to_onnx(self) -> bytes:
+        """Serializes the fitted forest as an ONNX graph that branches exactly like scikit-learn."""
+        # ONNX stores split thresholds as float32; round each one down to the nearest float32
+        # so `x <= threshold` gives exactly the same branch as scikit-learn's float64 thresholds.
+        onnx_source = copy.deepcopy(self.model)
+        for estimator in onnx_source.estimators_:
+            thresholds = estimator.tree_.threshold
+            rounded = thresholds.astype(np.float32)
+            thresholds[:] = np.where(rounded > thresholds, np.nextafter(rounded, np.float32(-np.inf)), rounded)
+        onnx_model = convert_sklearn(
+            onnx_source,
+            initial_types=[("input", FloatTensorType([None, len(self.feature_columns)]))],
+            options={id(onnx_source): {"zipmap": False}},
+            target_opset=17,
+        )
+        return onnx_model.SerializeToString()
             
-    def _generate_reasoning(self, fr: pd.Series, d: int, all_features_df: pd.DataFrame) -> str:
-        # ... (This reasoning function remains the same as the previous version)
+    def _generate_reasoning(self, fr: Dict, d: int, columns: Dict[str, np.ndarray]) -> str:
+        # `columns` are the extract_features context arrays, so every lookup below is a NumPy mask
         def _get_direction(origin_code: str) -> int:
             return 1 if origin_code == "SUR" else -1
+        def _first_min(mask: np.ndarray, key: np.ndarray):
+            # First row with the smallest `key` among `mask`, matching pandas' `.loc[key.idxmin()]`
+            candidates = np.flatnonzero(mask)
+            i = candidates[np.argmin(key[candidates])]
+            return columns['train_number'][i], key[i]
         my_direction = _get_direction(fr['origin'])
         my_km = fr['current_km']
         if d == 0: return f"Path clear with low downstream congestion ({fr['downstream_congestion']:.1f}). Proceeding to maintain schedule."
+        if d in (1, 3):
+            ahead_km = (columns['current_km'] - my_km) * my_direction
+            distance = np.abs(columns['current_km'] - my_km)
+            same_direction = (columns['train_number'] != fr['train_number']) & (columns['origin'] == fr['origin'])
         if d == 1:
-            trains_ahead_df = all_features_df[(all_features_df['train_number'] != fr['train_number']) & (all_features_df['origin'] == fr['origin']) & (((all_features_df['current_km'] - my_km) * my_direction) > 0) & (((all_features_df['current_km'] - my_km) * my_direction) < 25)].copy()
-            if not trains_ahead_df.empty:
-                trains_ahead_df['distance'] = abs(trains_ahead_df['current_km'] - my_km)
-                closest_train = trains_ahead_df.loc[trains_ahead_df['distance'].idxmin()]
-                return f"Reduce speed: Approaching slower train {closest_train['train_number']} which is {closest_train['distance']:.1f}km ahead."
+            trains_ahead = same_direction & (ahead_km > 0) & (ahead_km < 25)
+            if trains_ahead.any():
+                closest_number, closest_distance = _first_min(trains_ahead, distance)
+                return f"Reduce speed: Approaching slower train {closest_number} which is {closest_distance:.1f}km ahead."
             return f"Reduce speed due to high downstream congestion ({fr['downstream_congestion']:.1f}) requiring caution."
         if d == 2:
             if fr['conflicting_train_eta'] < 60:
-                opposing_trains_df = all_features_df[all_features_df['origin'] != fr['origin']].copy()
-                if not opposing_trains_df.empty:
-                    opposing_trains_df['eta_diff'] = abs(opposing_trains_df['conflicting_train_eta'] - fr['conflicting_train_eta'])
-                    conflict_train = opposing_trains_df.loc[opposing_trains_df['eta_diff'].idxmin()]
-                    return f"CRITICAL: Stop at next station to resolve head-on conflict with train {conflict_train['train_number']} at an upcoming single-line section."
+                opposing = columns['origin'] != fr['origin']
+                if opposing.any():
+                    eta_diff = np.abs(columns['conflicting_train_eta'] - fr['conflicting_train_eta'])
+                    conflict_number, _ = _first_min(opposing, eta_diff)
+                    return f"CRITICAL: Stop at next station to resolve head-on conflict with train {conflict_number} at an upcoming single-line section."
             return f"Stop at next station to regulate flow before bottleneck (in {fr['time_to_next_bottleneck']:.0f} min) which has high traffic."
         if d == 3:
-            trains_to_overtake_df = all_features_df[(all_features_df['train_number'] != fr['train_number']) & (all_features_df['origin'] == fr['origin']) & (all_features_df['train_priority'] < fr['train_priority']) & (((all_features_df['current_km'] - my_km) * my_direction) > 0) & (((all_features_df['current_km'] - my_km) * my_direction) < 40)].copy()
-            if not trains_to_overtake_df.empty:
-                trains_to_overtake_df['distance'] = abs(trains_to_overtake_df['current_km'] - my_km)
-                train_to_hold = trains_to_overtake_df.loc[trains_to_overtake_df['distance'].idxmin()]
-                return (f"Give Priority: High-priority train on schedule. Action: Train {train_to_hold['train_number']} should be held at its next stop to allow for an overtake.")
+            trains_to_overtake = same_direction & (columns['train_priority'] < fr['train_priority']) & (ahead_km > 0) & (ahead_km < 40)
+            if trains_to_overtake.any():
+                train_to_hold, _ = _first_min(trains_to_overtake, distance)
+                return (f"Give Priority: High-priority train on schedule. Action: Train {train_to_hold} should be held at its next stop to allow for an overtake.")
             return f"Give Priority: High-priority train (Level {fr['train_priority']:.0f}) proceeding on a clear path."
         if d == 4: return f"Hold/Reroute: Heavy delay ({fr['delay_minutes']:.0f} min) and high section traffic. Holding to stabilize network and prevent cascading delays."
         return "Decision based on optimizing overall section throughput."
 
-    # ... (other helper functions remain unchanged)
-    def _calculate_time_to_next_bottleneck(self, s, p):
-        if p.speed == 0: return 999.0
-        dist, d = float('inf'), 1 if s.origin == "SUR" else -1
-        for sk, ek in self.section.single_line_segments:
-            ep = sk if d == 1 else ek
-            de = (ep - p.current_km) * d
-            if 0 < de < dist: dist = de
-        return 999.0 if dist == float('inf') else (dist / p.speed) * 60
-    def _calculate_downstream_congestion(self, s, p, ap, lk=50):
-        c,d=0,1 if s.origin=="SUR" else -1
-        for op in ap:
-            if op.train_number==p.train_number:continue
-            if 0<(op.current_km-p.current_km)*d<=lk: c+=1
-        return c/(lk/10.0)
-    def _find_conflicting_train_eta(self, s, p, ap, asc):
-        d, sd = 1 if s.origin == "SUR" else -1, {sc.train_number: sc for sc in asc}
-        for sk, ek in self.section.single_line_segments:
-            mde = ((sk if d == 1 else ek) - p.current_km) * d
-            if mde < 0: continue
-            me = (mde/p.speed)*60 if p.speed>0 else 999.0
-            if me > 60: continue
-            for op in ap:
-                os=sd.get(op.train_number)
-                if not os or os.origin==s.origin: continue
-                od=-1*d
-                ode=((sk if od==1 else ek)-op.current_km)*od
-                if ode>0:
-                    oe=(ode/op.speed)*60 if op.speed>0 else 999.0
-                    if abs(me-oe)<10: return oe
-        return 999.0
-    def _count_trains_ahead(self, s, p, ap): return sum(1 for op in ap if op.train_number!=p.train_number and (op.current_km-p.current_km)*(1 if s.origin=="SUR" else -1)>0)
+    def _distance_to_segment_entries(self, km, direction):
+        entry = np.where(direction[:, None] == 1, self._segments[None, :, 0], self._segments[None, :, 1])
+        return (entry - km[:, None]) * direction[:, None]
+    @staticmethod
+    def _eta_minutes(distance, speed):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(speed > 0, (distance / speed) * 60, 999.0)
+    def _calculate_time_to_next_bottleneck(self, entry_km, speed):
+        dist = np.where(entry_km > 0, entry_km, np.inf).min(axis=1, initial=np.inf)
+        return np.where(np.isfinite(dist), self._eta_minutes(dist, speed), 999.0)
+    def _find_conflicting_train_eta(self, entry_km, speed, all_entry_km, all_speed, opposing):
+        # hits[i, k, j]: opposing train j reaches segment k within 10 min of train i (which gets there within the hour)
+        my_eta = self._eta_minutes(entry_km, speed[:, None])
+        their_eta = self._eta_minutes(all_entry_km, all_speed[:, None]).T
+        heading_in = (entry_km >= 0) & (my_eta <= 60)
+        hits = heading_in[:, :, None] & opposing[:, None, :] & (all_entry_km.T > 0)[None, :, :] & (np.abs(my_eta[:, :, None] - their_eta[None, :, :]) < 10)
+        flat = hits.reshape(len(speed), -1)
+        if flat.shape[1] == 0: return np.full(len(speed), 999.0)
+        # The first hit in (segment, position) order wins, as in the original nested loops
+        first = flat.argmax(axis=1)
+        return np.where(flat.any(axis=1), their_eta.reshape(-1)[first], 999.0)
     def _encode_train_type(self, tt): return {TrainType.FREIGHT: 1, TrainType.PASSENGER: 2, TrainType.EXPRESS: 3, TrainType.SUPERFAST: 4}[tt]
-    def _calculate_remaining_distance(self, s, p): return self.section.total_distance-p.current_km if s.origin=="SUR" else p.current_km
-    def _check_single_line_conflict(self, p): return 1 if any(s<=p.current_km<=e for s,e in self.section.single_line_segments) else 0
-    def _check_platform_availability(self, p):
-        if p.current_station:
-            st = next((s for s in self.section.stations if s.code == p.current_station), None)
-            if st: return st.platforms/6.0
-        return 0.5
+    def _single_line_mask(self, km): return ((km[:, None] >= self._segments[None, :, 0]) & (km[:, None] <= self._segments[None, :, 1])).any(axis=1)
+    def _check_platform_availability(self, p): return self._platform_ratio_cache.get(p.current_station, 0.5)
     def _calculate_train_frequency(self, s, t): return sum(1 for sc in s if 0<=(sc.scheduled_departure-t).total_seconds()/3600<=2)
     def calculate_throughput_metrics(self, s, p):
         at=[pos for pos in p if pos.status in [TrainStatus.RUNNING, TrainStatus.DELAYED, TrainStatus.STOPPED]]
         if not at: return {'active_trains': 0, 'average_delay_minutes': 0, 'average_speed_kmh': 0, 'bottleneck_utilization': 0, 'total_scheduled_trains': len(s)}
-        return {'active_trains':len(at), 'average_delay_minutes':round(np.mean([t.delay_minutes for t in at]),2), 'average_speed_kmh':round(np.mean([t.speed for t in at if t.speed>0]) if any(t.speed>0 for t in at) else 0,2), 'bottleneck_utilization':round(sum(1 for t in at if self._check_single_line_conflict(t))/len(self.section.single_line_segments) if self.section.single_line_segments else 0,2), 'total_scheduled_trains':len(s)}
\ No newline at end of file
+        # One pass to pull the three fields into arrays, then plain NumPy reductions
+        delay = np.fromiter((t.delay_minutes for t in at), dtype=np.float64, count=len(at))
+        speed = np.fromiter((t.speed for t in at), dtype=np.float64, count=len(at))
+        km = np.fromiter((t.current_km for t in at), dtype=np.float64, count=len(at))
+        moving = speed > 0
+        return {'active_trains':len(at), 'average_delay_minutes':round(delay.mean(),2), 'average_speed_kmh':round(speed[moving].mean() if moving.any() else 0,2), 'bottleneck_utilization':round(int(self._single_line_mask(km).sum())/len(self.section.single_line_segments) if self.section.single_line_segments else 0,2), 'total_scheduled_trains':len(s)}
\ No newline at end of file
@@ -2,11 +2,12 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from datetime import datetime
 import random # ENHANCEMENT: Import random to pick scenarios
+from threadpoolctl import threadpool_limits
 
 # ENHANCEMENT: Import AI classes and the new ScenarioType
 from ai_decision_model import RailwayDecisionAI
 from mock_data_generator import SolapurWadiDataGenerator
-from data_models import ScenarioType
+from data_models import ScenarioType, PositionsSoA
 
 app = Flask(__name__)
 CORS(app)
@@ -16,6 +17,13 @@ print("Initializing AI Decision Support System...")
 data_generator = SolapurWadiDataGenerator()
 ai_model = RailwayDecisionAI(data_generator.section)
 ai_model.load_model("railway_ai_model.joblib")
+# Requests score a handful of rows, so BLAS thread pools only add contention
+threadpool_limits(limits=1, user_api='blas')
+ai_model.warm_up()
+# Concurrent requests (threaded server) share one model call per batch
+ai_model.enable_batching()
+# Compile the generator's njit kernels now rather than on the first request; seeded so the live RNG stream is untouched
+data_generator.generate_scenario(ScenarioType.MAJOR_DISRUPTION, seed=0)
 print("System Ready. Waiting for requests...")
 # --------------------------------------------------------------------
 
@@ -36,10 +44,12 @@ def get_live_report():
     
     # 2. Call the single method that returns both schedules and positions.
     schedules, positions = data_generator.generate_scenario(scenario_to_generate)
+    # Array view for the vectorized feature helpers; the object lists are kept for the JSON payload.
+    soa = PositionsSoA.from_list(positions, schedules)
     # -------------------------------------------------------------
 
     # 3. Get fresh AI decisions and metrics for the generated problem
-    decisions = ai_model.predict_optimal_decisions(schedules, positions)
+    decisions = ai_model.predict_optimal_decisions(schedules, positions, soa)
     metrics = ai_model.calculate_throughput_metrics(schedules, positions)
     
     critical_decisions = {k: v for k, v in decisions.items() if v['decision'] != 'Proceed normally'}
@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 import enum
+import numpy as np
 
 # ENHANCEMENT: Add an enum for our problem-centric scenarios
 class ScenarioType(enum.Enum):
@@ -47,7 +48,8 @@ class TrainSchedule:
     scheduled_arrival: datetime
     stops: List[Dict[str, any]]
 
-@dataclass
+# Slotted: scenarios build one of these per train, so skip the per-instance __dict__
+@dataclass(slots=True)
 class TrainPosition:
     train_number: str
     current_station: Optional[str]
@@ -59,6 +61,28 @@ class TrainPosition:
     # ENHANCEMENT: Add origin for easier cascading delay logic
     origin: str = "SUR"
 
+@dataclass
+class PositionsSoA:
+    """Structure-of-arrays snapshot of a List[TrainPosition], one NumPy array per field, for the vectorized helpers."""
+    train_number: np.ndarray
+    km: np.ndarray
+    speed: np.ndarray
+    delay: np.ndarray
+    origin_sign: np.ndarray
+
+    @classmethod
+    def from_list(cls, positions: List[TrainPosition], schedules: List[TrainSchedule]) -> "PositionsSoA":
+        # Direction of travel comes from the schedule, like every feature helper; a position's own
+        # `origin` defaults to "SUR" and is only the fallback for trains without a schedule.
+        schedule_origin = {s.train_number: s.origin for s in schedules}
+        return cls(
+            train_number=np.array([p.train_number for p in positions], dtype=object),
+            km=np.array([p.current_km for p in positions], dtype=np.float64),
+            speed=np.array([p.speed for p in positions], dtype=np.float64),
+            delay=np.array([p.delay_minutes for p in positions], dtype=np.float64),
+            origin_sign=np.array([1 if schedule_origin.get(p.train_number, p.origin) == "SUR" else -1 for p in positions], dtype=np.int64),
+        )
+
 @dataclass
 class SectionInfo:
     section_name: str
@@ -67,4 +91,20 @@ class SectionInfo:
     total_distance: float
     max_speed: float
     stations: List[Station]
-    single_line_segments: List[tuple]
\ No newline at end of file
+    single_line_segments: List[tuple]
+    # Parallel per-station columns (km order, like `stations`) for the array code paths;
+    # derived from `stations`, and ndarray == is elementwise, so they stay out of __eq__
+    station_km: Optional[np.ndarray] = field(default=None, compare=False)
+    station_platforms: Optional[np.ndarray] = field(default=None, compare=False)
+    station_codes: Optional[np.ndarray] = field(default=None, compare=False)
+    # Station code -> row in the per-station arrays, built once with the section
+    station_index: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.station_km is None:
+            self.station_km = np.array([s.km_from_start for s in self.stations], dtype=np.float64)
+        if self.station_platforms is None:
+            self.station_platforms = np.array([s.platforms for s in self.stations], dtype=np.int32)
+        if self.station_codes is None:
+            self.station_codes = np.array([s.code for s in self.stations], dtype=object)
+        self.station_index = {code: i for i, code in enumerate(self.station_codes)}
\ No newline at end of file
@@ -1,8 +1,32 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from mock_data_generator import SolapurWadiDataGenerator
 from ai_decision_model import RailwayDecisionAI
-from data_models import ScenarioType
+from data_models import ScenarioType, PositionsSoA
+
+def build_scenario(task):
+    """
+    Generates one scenario and labels every active train in it via simulation.
+    Runs in a worker process, so it builds its own generator and model.
+    """
+    scenario_type, seed = task
+    # Seeded per curriculum slot, so the data is independent of worker scheduling
+    generator = SolapurWadiDataGenerator(seed=seed)
+    ai_model = RailwayDecisionAI(generator.section)
+
+    # Generate a specific problematic scenario
+    schedules, positions = generator.generate_scenario(scenario_type)
+    soa = PositionsSoA.from_list(positions, schedules)
+    # Extract features from this scenario
+    X, context = ai_model.extract_features(schedules, positions, soa)
+
+    # For each train in the scenario, find the best decision via simulation.
+    # The schedule lookup and simulation arrays are built once and shared by every train.
+    sim_arrays = ai_model._build_simulation_arrays(schedules, positions)
+    y_rows = [ai_model._generate_optimal_decision_by_simulation(row, schedules, positions, sim_arrays)
+              for row in ai_model._context_records(context)] if len(X) else []
+    return X.tolist(), y_rows
 
 def train_and_save_model():
     """
@@ -10,12 +34,12 @@ def train_and_save_model():
     difficult scenarios to ensure robust and diverse decision-making skills.
     """
     print("Initializing model training process with problem-centric curriculum...")
-    
+
     generator = SolapurWadiDataGenerator()
     ai_model = RailwayDecisionAI(generator.section)
-    
+
     all_X_data, all_y_data = [], []
-    
+
     # Define the curriculum: how many scenarios of each type to generate.
     # This ensures the AI sees many examples of each problem type.
     curriculum = {
@@ -23,38 +47,29 @@ def train_and_save_model():
         ScenarioType.MAJOR_DISRUPTION: 150,
         ScenarioType.HIGH_DENSITY: 150,
     }
-    
-    total_scenarios = sum(curriculum.values())
-    completed_scenarios = 0
-
-    for scenario_type, count in curriculum.items():
-        for i in range(count):
-            completed_scenarios += 1
-            print(f"\n--- Generating Scenario {completed_scenarios}/{total_scenarios} (Type: {scenario_type.name}) ---")
-            
-            # Generate a specific problematic scenario
-            schedules, positions = generator.generate_scenario(scenario_type)
-            # Extract features from this scenario
-            features_df = ai_model.extract_features(schedules, positions)
-            
-            if features_df.empty:
-                continue
-
-            # For each train in the scenario, find the best decision via simulation
-            for _, row in features_df.iterrows():
-                all_X_data.append([row[col] for col in ai_model.feature_columns])
-                decision = ai_model._generate_optimal_decision_by_simulation(row, schedules, positions)
-                all_y_data.append(decision)
+
+    # Every scenario is independent, so build and label them across all CPU cores.
+    # Each task is seeded by its position in the curriculum.
+    scenario_types = [scenario_type for scenario_type, count in curriculum.items() for _ in range(count)]
+    tasks = [(scenario_type, seed) for seed, scenario_type in enumerate(scenario_types)]
+    total_scenarios = len(tasks)
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(build_scenario, tasks, chunksize=4)
+        for completed_scenarios, ((scenario_type, _), (X_rows, y_rows)) in enumerate(zip(tasks, results), start=1):
+            print(f"\n--- Scenario {completed_scenarios}/{total_scenarios} done (Type: {scenario_type.name}, {len(X_rows)} samples) ---")
+            all_X_data.extend(X_rows)
+            all_y_data.extend(y_rows)
 
     print(f"\nGenerated {len(all_X_data)} total training samples from {total_scenarios} scenarios.")
-    
+
     # Train the AI model on the curated curriculum
     ai_model.train_model(np.array(all_X_data), np.array(all_y_data))
-    
+
     # Save the battle-hardened model
     ai_model.save_model("railway_ai_model.joblib")
-    
+
     print("\n✅ AI Model training complete and saved successfully!")
 
 if __name__ == "__main__":
-    train_and_save_model()
\ No newline at end of file
+    train_and_save_model()
@@ -1,151 +1,270 @@
-import random
-from datetime import datetime, timedelta
+import numpy as np
+import copy
+import functools
+from datetime import datetime
 from typing import List, Tuple
 from data_models import *
-from collections import defaultdict
+from numba_compat import njit
+
+# uint8 status codes for the array passes, in TrainStatus order; _ST_ARR maps them back to the enum.
+# Trains that finished over an hour ago are COMPLETED and left out of the positions.
+_ST_SCHEDULED, _ST_RUNNING, _ST_DELAYED, _ST_STOPPED, _ST_COMPLETED = 0, 1, 2, 3, 4
+_ST_ARR = np.array(list(TrainStatus), dtype=object)
+
+@njit(cache=True)
+def _knockon_core(order, boundaries, delays, statuses, rng_draws):
+    """
+    Walks trains in (origin, departure) order and passes part of a late train's delay on to the
+    next train from the same origin, updating `delays` and `statuses` in place. Each origin's
+    trains are contiguous in `order`, with `boundaries` holding the start of every group after the
+    first. Finished trains break the chain; `rng_draws[k]` is the knock-on factor for `order[k]`.
+    """
+    b = 0
+    for k in range(1, order.shape[0]):
+        if b < boundaries.shape[0] and k == boundaries[b]:
+            b += 1
+            continue
+        prev, curr = order[k - 1], order[k]
+        if statuses[prev] == _ST_COMPLETED or statuses[curr] == _ST_COMPLETED:
+            continue
+        if delays[prev] > 20 and statuses[curr] != _ST_SCHEDULED:
+            new_delay = delays[curr] + (delays[prev] - 15) * rng_draws[k]
+            delays[curr] = int(min(90.0, new_delay))
+            if delays[curr] > 25: statuses[curr] = _ST_DELAYED
+
+@njit(cache=True)
+def _occupancy_core(order, station_ids, platform_counts, statuses, speed, delays, km, direction):
+    """
+    Visits trains in `order` (furthest from destination first) and lets each running train at a
+    station take a platform; once a station is full, later arrivals are held just short of it.
+    All arrays are updated in place; a held train's station id becomes -1.
+    """
+    occupancy = np.zeros(platform_counts.shape[0], dtype=np.int32)
+    for idx in order:
+        sid = station_ids[idx]
+        if sid < 0 or (statuses[idx] != _ST_RUNNING and statuses[idx] != _ST_DELAYED):
+            continue
+        if occupancy[sid] >= platform_counts[sid]:
+            statuses[idx] = _ST_STOPPED
+            speed[idx] = 0
+            delays[idx] += 5
+            km[idx] -= direction[idx]
+            station_ids[idx] = -1
+        else:
+            occupancy[sid] += 1
 
 class SolapurWadiDataGenerator:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # One PCG64 stream per generator; scenarios draw their noise from it in whole vectors
+        self.rng = np.random.default_rng(seed)
         self.section = self._create_section_info()
+        # Station ids of the WDI and SUR terminals, indexed by the origin-is-SUR bit
+        self._terminal_ids = np.array([self.section.station_index["WDI"], self.section.station_index["SUR"]])
         self.current_time = datetime.now()
-        self.train_types = [
+        train_types = [
             (TrainType.PASSENGER, Priority.LOW, 50, 8), (TrainType.EXPRESS, Priority.MEDIUM, 80, 4),
             (TrainType.SUPERFAST, Priority.HIGH, 100, 2), (TrainType.FREIGHT, Priority.LOW, 60, 0),
         ]
+        # Parallel per-type columns, so a scenario samples all its type indices in one draw and gathers by fancy indexing
+        tt_type, tt_priority, tt_speed, _ = zip(*train_types)
+        self._tt_type = np.array(tt_type, dtype=object)
+        self._tt_priority = np.array(tt_priority, dtype=object)
+        self._tt_speed = np.array(tt_speed, dtype=float)
+        # Schedule naming parts per type, gathered per batch instead of formatted from the enum per train
+        is_freight = self._tt_type == TrainType.FREIGHT
+        self._tt_label = np.array([t.value.title() for t in tt_type], dtype=object)
+        self._tt_number_prefix = np.where(is_freight, "F", "").astype(object)
+        self._tt_number_base = np.where(is_freight, 50000, 13000)
+        # Section constants derived once; every scenario reuses them
+        self._total_distance = self.section.total_distance
+        self._bottleneck_mids = np.array([(a + b) / 2 for a, b in self.section.single_line_segments])
+        self._travel_hours_by_type = self._total_distance / self._tt_speed
+        self._routes = np.array([("SUR", "WDI"), ("WDI", "SUR")], dtype=object)
+        # Per-generator memo of seeded scenarios, keyed on plain values only
+        self._seeded_scenario = functools.lru_cache(maxsize=64)(self._generate_seeded_scenario)
+
+    @property
+    def _now64(self):
+        # current_time as datetime64, derived on use so reassigning current_time moves every schedule time with it
+        return np.datetime64(self.current_time, 'us')
 
     def _create_section_info(self) -> SectionInfo:
         stations_data = [("SUR", "Solapur", 0.0, 4), ("HOTGI", "Hotgi", 25.3, 2), ("INDI", "Indi", 45.8, 2), ("BIJAPUR", "Bijapur", 78.2, 3), ("ALMATTI", "Almatti", 95.5, 1), ("BAGALKOT", "Bagalkot", 125.7, 2), ("BADAMI", "Badami", 142.3, 2), ("GADAG", "Gadag", 168.9, 3), ("WDI", "Wadi", 455.3, 3)]
         stations = [Station(code, name, km, p) for code, name, km, p in stations_data]
+        codes, _, kms, platforms = zip(*stations_data)
         single_line_segments = [(25.3, 45.8), (142.3, 168.9)]
-        return SectionInfo("Solapur-Wadi", "SUR", "WDI", 455.3, 110.0, stations, single_line_segments)
+        return SectionInfo("Solapur-Wadi", "SUR", "WDI", 455.3, 110.0, stations, single_line_segments,
+                           np.array(kms, dtype=np.float64), np.array(platforms, dtype=np.int32), np.array(codes, dtype=object))
 
-    def generate_scenario(self, scenario_type: ScenarioType, num_trains: int = 25) -> Tuple[List[TrainSchedule], List[TrainPosition]]:
+    def generate_scenario(self, scenario_type: ScenarioType, num_trains: int = 25, seed: Optional[int] = None) -> Tuple[List[TrainSchedule], List[TrainPosition]]:
+        """
+        Generates a scenario from the generator's own stream, or, when `seed` is given, the one
+        deterministic scenario for that seed. Seeded scenarios are memoized; callers get fresh copies.
+        """
+        if seed is None:
+            return self._generate_scenario(scenario_type, num_trains, self.rng)
+        schedules, positions = self._seeded_scenario(scenario_type, num_trains, seed, self.current_time)
+        # Per-object copies (a deepcopy costs more than regenerating); `stops` is the only mutable field
+        schedules = [copy.copy(s) for s in schedules]
+        for s in schedules: s.stops = list(s.stops)
+        return schedules, [copy.copy(p) for p in positions]
+
+    def _generate_seeded_scenario(self, scenario_type, num_trains, seed, current_time):
+        # `current_time` is only part of the cache key: schedule times are relative to the generator's clock.
+        # The seeded stream is passed down explicitly, so the shared self.rng is never touched.
+        schedules, positions = self._generate_scenario(scenario_type, num_trains, np.random.default_rng(seed))
+        return tuple(schedules), tuple(positions)
+
+    def _generate_scenario(self, scenario_type, num_trains, rng):
         print(f"🔥 Generating SCENARIO: {scenario_type.value.upper()}")
         if scenario_type == ScenarioType.MAJOR_DISRUPTION:
-            return self._generate_disruption_scenario(num_trains)
+            return self._generate_disruption_scenario(num_trains, rng)
         elif scenario_type == ScenarioType.BOTTLENECK_CONFLICT:
-            return self._generate_bottleneck_conflict_scenario(num_trains)
+            return self._generate_bottleneck_conflict_scenario(num_trains, rng)
         elif scenario_type == ScenarioType.HIGH_DENSITY:
-            return self._generate_high_density_scenario(num_trains)
-
-    def _generate_base_schedule(self, i, origin, destination, departure_time):
-        train_type, priority, avg_speed, _ = random.choice(self.train_types)
-        train_number = f"F{50000 + i}" if train_type == TrainType.FREIGHT else f"{13000 + i}"
-        travel_time_hours = self.section.total_distance / avg_speed * random.uniform(0.9, 1.2)
-        arrival_time = departure_time + timedelta(hours=travel_time_hours)
-        return TrainSchedule(train_number, f"{train_type.value.title()} {train_number}", train_type, priority, origin, destination, departure_time, arrival_time, [])
-
-    def _generate_disruption_scenario(self, num_trains):
-        schedules = []
-        disrupted_train_dep_time = self.current_time - timedelta(hours=random.uniform(1.5, 2.5))
-        disrupted_train = self._generate_base_schedule(99, "SUR", "WDI", disrupted_train_dep_time)
-        disrupted_train.priority = Priority.HIGH
-        schedules.append(disrupted_train)
-        for i in range(num_trains - 1):
-            departure_offset = timedelta(hours=random.uniform(-3, 1))
-            schedules.append(self._generate_base_schedule(i, *random.choice([("SUR", "WDI"), ("WDI", "SUR")]), self.current_time + departure_offset))
-        positions = self._create_positions(schedules, disrupted_train_number=disrupted_train.train_number)
+            return self._generate_high_density_scenario(num_trains, rng)
+
+    @staticmethod
+    def _draw_indices(rng, k, n):
+        # n uniform indices in [0, k); flooring one random() vector costs half of rng.integers at these sizes
+        return (rng.random(n) * k).astype(np.intp)
+
+    def _sample_train_types(self, n, rng):
+        return self._draw_indices(rng, len(self._tt_speed), n)
+
+    def _times_after_now(self, hours):
+        return self._now64 + np.rint(np.asarray(hours) * 3.6e9).astype('timedelta64[us]')
+
+    def _generate_base_schedules_batch(self, indices, origins, destinations, departure_times, rng):
+        """
+        Builds one TrainSchedule per index, drawing every train type and travel-time noise in one go.
+        Also returns the departure/arrival datetime64 arrays so _create_positions can reuse them.
+        """
+        m = len(indices)
+        type_idx = self._sample_train_types(m, rng)
+        travel_hours = self._travel_hours_by_type[type_idx] * rng.uniform(0.9, 1.2, m)
+        dep64 = np.asarray(departure_times, dtype='datetime64[us]')
+        arr64 = np.add(dep64, np.rint(travel_hours * 3.6e9).astype('timedelta64[us]'))
+        types, priorities = self._tt_type[type_idx], self._tt_priority[type_idx]
+        numbers = [prefix + str(n) for prefix, n in zip(self._tt_number_prefix[type_idx], (self._tt_number_base[type_idx] + indices).tolist())]
+        schedules = [TrainSchedule(number, f"{label} {number}", t, p, o, d, dep, arr, [])
+                     for number, label, t, p, o, d, dep, arr in zip(numbers, self._tt_label[type_idx], types, priorities, origins, destinations, dep64.tolist(), arr64.tolist())]
+        return schedules, dep64, arr64
+
+    # Each *_specs helper returns (indices, origins, destinations, departures) arrays; a scenario
+    # concatenates its specs and builds every schedule with a single batch factory call.
+    def _filler_specs(self, n, earliest_hours, latest_hours, rng):
+        """Background traffic: n trains in random directions departing within the given window around now."""
+        n = max(n, 0)  # the fixed trains may already meet or exceed num_trains
+        routes = self._routes[self._draw_indices(rng, 2, n)]
+        return np.arange(n), routes[:, 0], routes[:, 1], self._times_after_now(rng.uniform(earliest_hours, latest_hours, n))
+
+    def _conflict_pair_specs(self, bottleneck_mid_km, rng):
+        """Two opposing trains timed to meet at the middle of a single-line bottleneck 20-45 minutes from now."""
+        conflict_hours = rng.uniform(20, 45) / 60
+        speed1, speed2 = self._tt_speed[self._sample_train_types(2, rng)]
+        conflict_deps = self._times_after_now(conflict_hours - np.array([bottleneck_mid_km / speed1, (self._total_distance - bottleneck_mid_km) / speed2]))
+        return np.array([99, 98]), np.array(["SUR", "WDI"], dtype=object), np.array(["WDI", "SUR"], dtype=object), conflict_deps
+
+    @staticmethod
+    def _join_specs(*specs):
+        return tuple(np.concatenate(column) for column in zip(*specs))
+
+    def _generate_disruption_scenario(self, num_trains, rng):
+        disrupted = np.array([99]), np.array(["SUR"], dtype=object), np.array(["WDI"], dtype=object), self._times_after_now([-rng.uniform(1.5, 2.5)])
+        schedules, dep64, arr64 = self._generate_base_schedules_batch(*self._join_specs(disrupted, self._filler_specs(num_trains - 1, -3, 1, rng)), rng)
+        schedules[0].priority = Priority.HIGH
+        positions = self._create_positions(schedules, rng, schedules[0].train_number, dep64, arr64)
         return schedules, positions
 
-    def _generate_bottleneck_conflict_scenario(self, num_trains):
-        schedules = []
-        bottleneck = random.choice(self.section.single_line_segments)
-        conflict_time = self.current_time + timedelta(minutes=random.uniform(20, 45))
-        bottleneck_mid_km = (bottleneck[0] + bottleneck[1]) / 2
-        _, _, speed1, _ = random.choice(self.train_types)
-        dep_time1 = conflict_time - timedelta(hours=bottleneck_mid_km / speed1)
-        schedules.append(self._generate_base_schedule(99, "SUR", "WDI", dep_time1))
-        _, _, speed2, _ = random.choice(self.train_types)
-        dep_time2 = conflict_time - timedelta(hours=(self.section.total_distance - bottleneck_mid_km) / speed2)
-        schedules.append(self._generate_base_schedule(98, "WDI", "SUR", dep_time2))
-        for i in range(num_trains - 2):
-            departure_offset = timedelta(hours=random.uniform(-3, 1))
-            schedules.append(self._generate_base_schedule(i, *random.choice([("SUR", "WDI"), ("WDI", "SUR")]), self.current_time + departure_offset))
-        positions = self._create_positions(schedules)
+    def _generate_bottleneck_conflict_scenario(self, num_trains, rng):
+        conflict = self._conflict_pair_specs(self._bottleneck_mids[rng.integers(len(self._bottleneck_mids))], rng)
+        schedules, dep64, arr64 = self._generate_base_schedules_batch(*self._join_specs(conflict, self._filler_specs(num_trains - 2, -3, 1, rng)), rng)
+        positions = self._create_positions(schedules, rng, None, dep64, arr64)
         return schedules, positions
 
-    def _generate_high_density_scenario(self, num_trains):
-        schedules = []
-        for i in range(num_trains):
-            departure_offset = timedelta(minutes=random.uniform(-120, 30))
-            schedules.append(self._generate_base_schedule(i, *random.choice([("SUR", "WDI"), ("WDI", "SUR")]), self.current_time + departure_offset))
-        positions = self._create_positions(schedules)
+    def _generate_high_density_scenario(self, num_trains, rng):
+        schedules, dep64, arr64 = self._generate_base_schedules_batch(*self._filler_specs(num_trains, -2, 0.5, rng), rng)
+        positions = self._create_positions(schedules, rng, None, dep64, arr64)
         return schedules, positions
-    
-    def _create_positions(self, schedules, disrupted_train_number=None):
-        positions = []
-        
-        for schedule in schedules:
-            if self.current_time < schedule.scheduled_departure:
-                positions.append(TrainPosition(schedule.train_number, schedule.origin, 0, 0, TrainStatus.SCHEDULED, 0, self.current_time, schedule.origin))
-                continue
-            if self.current_time > schedule.scheduled_arrival + timedelta(hours=1):
-                continue
-
-            journey_duration_hrs = (schedule.scheduled_arrival - schedule.scheduled_departure).total_seconds() / 3600
-            time_elapsed_hrs = (self.current_time - schedule.scheduled_departure).total_seconds() / 3600
-            ideal_progress = min(1.0, time_elapsed_hrs / journey_duration_hrs) if journey_duration_hrs > 0 else 0
-
-            delay = int(random.uniform(5, 30) * ideal_progress)
-            progress = max(0, ideal_progress - (delay / (journey_duration_hrs * 60)) * 0.5) if journey_duration_hrs > 0 else 0
-            
-            current_km = progress * self.section.total_distance if schedule.origin == "SUR" else self.section.total_distance * (1 - progress)
-            speed = (self.section.total_distance / journey_duration_hrs) * random.uniform(0.6, 1.1) if journey_duration_hrs > 0 else 0
-            status = TrainStatus.DELAYED if delay > 25 else TrainStatus.RUNNING
-            
-            if disrupted_train_number and schedule.train_number == disrupted_train_number:
-                current_km = random.uniform(100, 300)
-                speed, status, delay = 0, TrainStatus.STOPPED, delay + 60
-
-            current_station = next((s.code for s in self.section.stations if abs(s.km_from_start - current_km) < 1), None)
-            if speed < 5: status = TrainStatus.STOPPED
-            if status == TrainStatus.STOPPED: speed = 0
-
-            # --- FIX IS HERE: Using keyword arguments to ensure correct assignment ---
-            positions.append(TrainPosition(
-                train_number=schedule.train_number,
-                current_station=current_station,
-                current_km=round(current_km, 2),
-                speed=round(speed, 2),
-                status=status,
-                delay_minutes=delay,
-                last_updated=self.current_time,
-                origin=schedule.origin
-            ))
-        
-        pos_dict = {p.train_number: p for p in positions}
-        schedules_by_origin = defaultdict(list)
-        for s in schedules: schedules_by_origin[s.origin].append(s)
-
-        for origin in schedules_by_origin:
-            sorted_schedules = sorted(schedules_by_origin[origin], key=lambda s: s.scheduled_departure)
-            for i in range(1, len(sorted_schedules)):
-                prev_s, curr_s = sorted_schedules[i-1], sorted_schedules[i]
-                
-                if prev_s.train_number in pos_dict and curr_s.train_number in pos_dict:
-                    prev_p = pos_dict[prev_s.train_number]
-                    curr_p = pos_dict[curr_s.train_number]
-
-                    if prev_p.delay_minutes > 20 and curr_p.status != TrainStatus.SCHEDULED:
-                        knock_on_delay = (prev_p.delay_minutes - 15) * random.uniform(0.2, 0.5)
-                        new_delay = curr_p.delay_minutes + knock_on_delay
-                        curr_p.delay_minutes = int(min(90, new_delay))
-                        if curr_p.delay_minutes > 25: curr_p.status = TrainStatus.DELAYED
-
-        station_occupancy = defaultdict(int)
-        station_map = {s.code: s for s in self.section.stations}
-        positions.sort(key=lambda p: abs(p.current_km - (self.section.total_distance if p.origin == "SUR" else 0)), reverse=True)
-        for p in positions:
-            if p.current_station and p.status in [TrainStatus.RUNNING, TrainStatus.DELAYED]:
-                station_code = p.current_station
-                platforms = station_map[station_code].platforms
-                if station_occupancy[station_code] >= platforms:
-                    p.status = TrainStatus.STOPPED
-                    p.speed = 0
-                    p.delay_minutes += 5
-                    p.current_km -= (1 * (1 if p.origin == "SUR" else -1))
-                    p.current_station = None
-                else:
-                    station_occupancy[station_code] += 1
-        
-        return positions
\ No newline at end of file
+
+    @staticmethod
+    def _propagate_knockon(dep_ts, origin_bit, delays, statuses, rng_draws):
+        # Stable, so trains departing together keep schedule order as sorted() did
+        order = np.lexsort((dep_ts, origin_bit))
+        # origin_bit is sorted ascending in `order`, so the only group boundary is the count of zeros
+        n_first = len(origin_bit) - int(origin_bit.sum())
+        boundaries = np.array([n_first] if 0 < n_first < len(origin_bit) else [], dtype=np.intp)
+        _knockon_core(order, boundaries, delays, statuses, rng_draws)
+
+    def _create_positions(self, schedules, rng, disrupted_train_number=None, dep64=None, arr64=None):
+        n = len(schedules)
+        td, now, now64, section = self._total_distance, self.current_time, self._now64, self.section
+
+        # Structure-of-arrays view of the schedules so the kinematics below run as a handful of
+        # vectorized NumPy expressions instead of a per-train loop. Times are int64 microseconds;
+        # the scenario builders pass the batch factory's datetime64 arrays instead of re-parsing datetimes.
+        if dep64 is None:
+            dep64 = np.array([s.scheduled_departure for s in schedules], dtype='datetime64[us]')
+            arr64 = np.array([s.scheduled_arrival for s in schedules], dtype='datetime64[us]')
+        elapsed_us = (now64 - dep64).astype(np.int64)
+        journey_us = (arr64 - dep64).astype(np.int64)
+        numbers = np.array([s.train_number for s in schedules], dtype=object)
+        origins = np.array([s.origin for s in schedules], dtype=object)
+        origin_sur = origins == "SUR"
+        is_scheduled = elapsed_us < 0
+        is_finished = ~is_scheduled & ((now64 - arr64).astype(np.int64) > 3_600_000_000)
+
+        journey_duration_hrs = journey_us / 3.6e9
+        time_elapsed_hrs = elapsed_us / 3.6e9
+        has_journey = journey_duration_hrs > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ideal_progress = np.where(has_journey, np.minimum(1.0, time_elapsed_hrs / journey_duration_hrs), 0.0)
+            delay = (rng.uniform(5, 30, n) * ideal_progress).astype(int)
+            progress = np.where(has_journey, np.maximum(0, ideal_progress - (delay / (journey_duration_hrs * 60)) * 0.5), 0.0)
+            speed = np.where(has_journey, (td / journey_duration_hrs) * rng.uniform(0.6, 1.1, n), 0.0)
+        current_km = np.where(origin_sur, progress * td, td * (1 - progress))
+        is_delayed = delay > 25
+
+        is_disrupted = (numbers == disrupted_train_number) & ~is_scheduled & ~is_finished
+        if is_disrupted.any():
+            current_km[is_disrupted] = rng.uniform(100, 300, int(is_disrupted.sum()))
+            speed[is_disrupted] = 0
+            delay[is_disrupted] += 60
+
+        is_stopped = is_disrupted | (speed < 5)
+        speed[is_stopped] = 0
+
+        # Not-yet-departed trains wait at their origin; everything below works on these arrays
+        current_km[is_scheduled] = 0
+        speed[is_scheduled] = 0
+        delay = np.where(is_scheduled, 0, delay).astype(np.int64)
+
+        # Nearest station on either side of each train; it counts as "at" the station within 1 km
+        station_km = section.station_km
+        # Searching the interior stations yields the right-hand neighbour index already clamped to [1, S-1]
+        idx = np.searchsorted(station_km[1:-1], current_km) + 1
+        nearest = np.where(np.abs(current_km - station_km[idx - 1]) <= np.abs(station_km[idx] - current_km), idx - 1, idx)
+        station_ids = np.where(is_scheduled, self._terminal_ids[origin_sur.astype(np.intp)], np.where(np.abs(station_km[nearest] - current_km) < 1.0, nearest, -1)).astype(np.int64)
+
+        # Later assignments win: scheduled > completed > stopped > delayed > running
+        status_codes = np.full(n, _ST_RUNNING, dtype=np.uint8)
+        status_codes[is_delayed] = _ST_DELAYED
+        status_codes[is_stopped] = _ST_STOPPED
+        status_codes[is_finished] = _ST_COMPLETED
+        status_codes[is_scheduled] = _ST_SCHEDULED
+        self._propagate_knockon(dep64.astype(np.int64), origin_sur.astype(np.int8), delay, status_codes, rng.uniform(0.2, 0.5, n))
+
+        # Platform capping visits trains furthest from their destination first (stable, like list.sort)
+        np.round(current_km, 2, out=current_km)
+        np.round(speed, 2, out=speed)
+        present = np.flatnonzero(status_codes != _ST_COMPLETED)
+        sort_key = np.where(origin_sur, td - current_km, current_km)
+        order = present[np.argsort(-sort_key[present], kind='stable')]
+        _occupancy_core(order, station_ids, section.station_platforms, status_codes, speed, delay, current_km, np.where(origin_sur, 1.0, -1.0))
+
+        # Every column is gathered into output order once; objects are built straight from the final arrays
+        stations = np.where(station_ids >= 0, section.station_codes[station_ids], None)
+        columns = (numbers[order], stations[order], current_km[order].tolist(), speed[order].tolist(), _ST_ARR[status_codes[order]], delay[order].tolist(), origins[order])
+        return [TrainPosition(number, station, km, sp, status, delay_min, now, origin)
+                for number, station, km, sp, status, delay_min, origin in zip(*columns)]
@@ -0,0 +1,7 @@
+# Optional: numba compiles the numeric hot loops to machine code. Without it, @njit is a
+# no-op decorator and the same functions run as plain Python/NumPy.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func